@@ -1,18 +1,29 @@
 use std::fs::File;
-use std::io::{BufRead, BufReader, Cursor};
+use std::io::{BufRead, BufReader, Read};
+#[cfg(unix)]
+use std::os::fd::{BorrowedFd, RawFd};
 use std::path::Path;
 
-use flate2::read::GzDecoder;
+use flate2::read::MultiGzDecoder;
+use memmap2::{Mmap, MmapOptions};
 use polars::{frame::DataFrame, prelude::Schema};
+use pyo3::buffer::PyBuffer;
+use pyo3::intern;
 use pyo3::prelude::*;
+use pyo3::types::{PyBytes, PyMemoryView};
 use pyo3_polars::PyDataFrame;
 use rpsl_parser::{ParseError, RpslParser};
 use thiserror::Error;
 
+mod names;
+mod parallel;
+mod reader;
 mod schema;
 mod schemaless;
 
+use reader::PyReader;
 use schema::SchemaPolarsBuilder;
+pub use schemaless::Layout;
 use schemaless::PolarsBuilder;
 
 #[derive(Error, Debug)]
@@ -30,31 +41,167 @@ pub enum RpslError {
     Io(#[from] std::io::Error),
 }
 
+/// Leading bytes of a gzip stream
+const GZIP_MAGIC: [u8; 2] = [0x1f, 0x8b];
+
+/// Size of the buffer between a streamed input and the parser
+const STREAM_BUFFER_SIZE: usize = 4 << 20;
+
+/// A file with the bytes already read from its start chained back in front
+type Prefixed = std::io::Chain<std::io::Take<std::io::Cursor<[u8; 2]>>, File>;
+
+/// An input file opened for parsing
+enum Input {
+    /// Gzip-compressed file, decompressed as it is parsed
+    Gzip(BufReader<MultiGzDecoder<Prefixed>>),
+
+    /// Uncompressed file that cannot be mapped (a pipe, tty, procfs file,
+    /// ...), read sequentially
+    Stream(BufReader<Prefixed>),
+
+    /// Uncompressed regular file, mapped into memory
+    Plain(Mmap),
+}
+
+/// Open a file, detecting gzip compression from its content.
+///
+/// The file is opened once and its first bytes are read once; nothing is
+/// re-opened, re-read or seeked to choose between streaming and mapping it.
+fn open_input(path: &Path) -> std::io::Result<Input> {
+    let mut file = File::open(path)?;
+    // Only regular files can be mapped; anything else is streamed
+    let metadata = file.metadata()?;
+    let regular = metadata.is_file();
+    if regular {
+        advise(&file, Access::Sequential);
+    }
+
+    let mut magic = [0u8; GZIP_MAGIC.len()];
+    let n = read_prefix(&mut file, &mut magic)?;
+    let gzip = n == GZIP_MAGIC.len() && magic == GZIP_MAGIC;
+
+    if regular && !gzip {
+        // The mapping covers the whole file regardless of the read position
+        return Ok(Input::Plain(map_file(&file, metadata.len())?));
+    }
+
+    let prefixed: Prefixed = std::io::Cursor::new(magic).take(n as u64).chain(file);
+    if gzip {
+        let decoder = MultiGzDecoder::new(prefixed);
+        let reader = BufReader::with_capacity(STREAM_BUFFER_SIZE, decoder);
+        Ok(Input::Gzip(reader))
+    } else {
+        let reader = BufReader::with_capacity(STREAM_BUFFER_SIZE, prefixed);
+        Ok(Input::Stream(reader))
+    }
+}
+
+/// Fill `buf` from the start of `file`, stopping early only at end of file.
+///
+/// Pipes may return short reads before the end of the stream, so a single
+/// `read` is not enough to tell gzip input from plain text.
+fn read_prefix(file: &mut File, buf: &mut [u8]) -> std::io::Result<usize> {
+    let mut n = 0;
+    while n < buf.len() {
+        match file.read(&mut buf[n..]) {
+            Ok(0) => break,
+            Ok(k) => n += k,
+            Err(e) if e.kind() == std::io::ErrorKind::Interrupted => {}
+            Err(e) => return Err(e),
+        }
+    }
+    Ok(n)
+}
+
+/// Memory-map a file for reading, prefaulting its pages up front so that
+/// parallel parsing is not serialized on page faults.
+///
+/// `len` is the size of the file, as already known from its metadata, so
+/// that mapping it needs no further fstat.
+fn map_file(file: &File, len: u64) -> std::io::Result<Mmap> {
+    let len = usize::try_from(len)
+        .map_err(|_| std::io::Error::other("file is too large to be mapped"))?;
+    advise(file, Access::WillNeed);
+    // SAFETY: the mapping is read-only. As with any file mapping, the file
+    // must not be truncated while it is being read.
+    unsafe { MmapOptions::new().len(len).populate().map(file) }
+}
+
+/// How a file is about to be read, as a hint to the kernel
+#[derive(Clone, Copy)]
+enum Access {
+    /// Front to back, so read-ahead can be more aggressive
+    Sequential,
+
+    /// In full, so read-ahead of the whole file can start right away
+    WillNeed,
+}
+
+fn advise(file: &File, access: Access) {
+    #[cfg(any(target_os = "linux", target_os = "android"))]
+    {
+        use std::os::fd::AsRawFd;
+
+        let advice = match access {
+            Access::Sequential => libc::POSIX_FADV_SEQUENTIAL,
+            Access::WillNeed => libc::POSIX_FADV_WILLNEED,
+        };
+        // SAFETY: the descriptor is valid for the lifetime of `file`. The
+        // call is purely advisory, so its result is ignored.
+        unsafe { libc::posix_fadvise(file.as_raw_fd(), 0, 0, advice) };
+    }
+
+    #[cfg(not(any(target_os = "linux", target_os = "android")))]
+    let _ = (file, access);
+}
+
 // =============================================================================
 // Schema-less reading
 // =============================================================================
 
-/// Read RPSL data from a buffered reader into a Polars DataFrame (schema-less)
-pub fn read_rpsl_from_reader<R: BufRead>(reader: R) -> Result<DataFrame, ParseError> {
-    let mut parser = RpslParser::new(PolarsBuilder::new());
+/// Read RPSL data from a buffered reader into a Polars DataFrame (schema-less).
+///
+/// With `categorical_names`, attribute names are returned as `Categorical`
+/// rather than `String`.
+pub fn read_rpsl_from_reader<R: BufRead>(
+    reader: R,
+    layout: Layout,
+    categorical_names: bool,
+) -> Result<DataFrame, ParseError> {
+    let mut parser = RpslParser::new(PolarsBuilder::new(layout, categorical_names));
     parser.parse(reader)?;
     let polars_builder = parser.into_callbacks();
     Ok(polars_builder.build())
 }
 
-/// Read RPSL data from a file path into a Polars DataFrame (schema-less)
+/// Read in-memory RPSL data into a Polars DataFrame (schema-less).
+///
+/// Large inputs are split on object boundaries and parsed in parallel.
+pub fn read_rpsl_from_slice(
+    data: &[u8],
+    layout: Layout,
+    categorical_names: bool,
+) -> Result<DataFrame, RpslError> {
+    parallel::parse_slice(
+        data,
+        || Ok(PolarsBuilder::new(layout, categorical_names)),
+        |b| Ok(b.build()),
+    )
+}
+
+/// Read RPSL data from a file path into a Polars DataFrame (schema-less).
+///
+/// Gzip-compressed files are detected from their content and decompressed
+/// while they are parsed.
 pub fn read_rpsl_from_path<P: AsRef<Path>>(
     path: P,
+    layout: Layout,
+    categorical_names: bool,
 ) -> Result<DataFrame, Box<dyn std::error::Error>> {
-    let path = path.as_ref();
-    let file = File::open(path)?;
-
-    let df = if path.extension().and_then(|s| s.to_str()) == Some("gz") {
-        let reader = BufReader::new(GzDecoder::new(file));
-        read_rpsl_from_reader(reader)?
-    } else {
-        let reader = BufReader::new(file);
-        read_rpsl_from_reader(reader)?
+    let df = match open_input(path.as_ref())? {
+        Input::Gzip(reader) => read_rpsl_from_reader(reader, layout, categorical_names)?,
+        Input::Stream(reader) => read_rpsl_from_reader(reader, layout, categorical_names)?,
+        Input::Plain(mmap) => read_rpsl_from_slice(&mmap, layout, categorical_names)?,
     };
 
     Ok(df)
@@ -76,20 +223,32 @@ pub fn read_rpsl_with_schema_from_reader<R: BufRead>(
     builder.build()
 }
 
-/// Read RPSL data from a file path with a specific schema
+/// Read in-memory RPSL data with a specific schema.
+///
+/// Large inputs are split on object boundaries and parsed in parallel.
+pub fn read_rpsl_with_schema_from_slice(
+    data: &[u8],
+    schema: &Schema,
+) -> Result<DataFrame, RpslError> {
+    parallel::parse_slice(
+        data,
+        || SchemaPolarsBuilder::new(schema),
+        SchemaPolarsBuilder::build,
+    )
+}
+
+/// Read RPSL data from a file path with a specific schema.
+///
+/// Gzip-compressed files are detected from their content and decompressed
+/// while they are parsed.
 pub fn read_rpsl_with_schema_from_path<P: AsRef<Path>>(
     path: P,
     schema: &Schema,
 ) -> Result<DataFrame, RpslError> {
-    let path = path.as_ref();
-    let file = File::open(path)?;
-
-    let df = if path.extension().and_then(|s| s.to_str()) == Some("gz") {
-        let reader = BufReader::new(GzDecoder::new(file));
-        read_rpsl_with_schema_from_reader(reader, schema)?
-    } else {
-        let reader = BufReader::new(file);
-        read_rpsl_with_schema_from_reader(reader, schema)?
+    let df = match open_input(path.as_ref())? {
+        Input::Gzip(reader) => read_rpsl_with_schema_from_reader(reader, schema)?,
+        Input::Stream(reader) => read_rpsl_with_schema_from_reader(reader, schema)?,
+        Input::Plain(mmap) => read_rpsl_with_schema_from_slice(&mmap, schema)?,
     };
 
     Ok(df)
@@ -99,12 +258,30 @@ pub fn read_rpsl_with_schema_from_path<P: AsRef<Path>>(
 // Python bindings
 // =============================================================================
 
+fn parse_layout(layout: &str) -> PyResult<Layout> {
+    match layout {
+        "aos" => Ok(Layout::Aos),
+        "soa" => Ok(Layout::Soa),
+        _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+            "layout must be 'aos' or 'soa', got '{layout}'"
+        ))),
+    }
+}
+
 #[pyfunction]
-#[pyo3(name = "read_rpsl", signature = (path, schema=None))]
-fn py_read_rpsl(path: &str, schema: Option<PyDataFrame>) -> PyResult<PyDataFrame> {
-    match schema {
+#[pyo3(name = "read_rpsl", signature = (path, schema=None, layout="aos", categorical_names=false))]
+fn py_read_rpsl(
+    py: Python<'_>,
+    path: &str,
+    schema: Option<PyDataFrame>,
+    layout: &str,
+    categorical_names: bool,
+) -> PyResult<PyDataFrame> {
+    let layout = parse_layout(layout)?;
+    // Opening, decompressing and parsing the file need no Python objects
+    py.detach(|| match schema {
         None => {
-            let df = read_rpsl_from_path(path)
+            let df = read_rpsl_from_path(path, layout, categorical_names)
                 .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
             Ok(PyDataFrame(df))
         }
@@ -114,31 +291,171 @@ fn py_read_rpsl(path: &str, schema: Option<PyDataFrame>) -> PyResult<PyDataFrame
                 .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
             Ok(PyDataFrame(df))
         }
-    }
+    })
 }
 
-#[pyfunction]
-#[pyo3(name = "read_rpsl_bytes", signature = (data, schema=None))]
-fn py_read_rpsl_bytes(data: &[u8], schema: Option<PyDataFrame>) -> PyResult<PyDataFrame> {
-    let reader = BufReader::new(Cursor::new(data));
-    match schema {
-        None => {
-            let df = read_rpsl_from_reader(reader)
-                .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
-            Ok(PyDataFrame(df))
-        }
+fn to_py_err<E: std::fmt::Display>(e: E) -> PyErr {
+    PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string())
+}
+
+/// Parse from any buffered reader, with or without a schema
+fn read_to_py<R: BufRead>(
+    reader: R,
+    schema: Option<PyDataFrame>,
+    layout: Layout,
+    categorical_names: bool,
+) -> PyResult<PyDataFrame> {
+    let df = match schema {
+        None => read_rpsl_from_reader(reader, layout, categorical_names).map_err(to_py_err)?,
         Some(schema_df) => {
             let polars_schema = schema_df.0.schema();
-            let df = read_rpsl_with_schema_from_reader(reader, &polars_schema)
-                .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
-            Ok(PyDataFrame(df))
+            read_rpsl_with_schema_from_reader(reader, &polars_schema).map_err(to_py_err)?
         }
+    };
+    Ok(PyDataFrame(df))
+}
+
+/// Parse in-memory data, with or without a schema.
+///
+/// With `release_gil`, the GIL is released for the duration of the parse.
+/// Otherwise it stays held by the calling thread, so that no Python code can
+/// modify `data` meanwhile; the worker threads parsing it never need the GIL.
+fn slice_to_py(
+    py: Python<'_>,
+    data: &[u8],
+    schema: Option<PyDataFrame>,
+    layout: Layout,
+    categorical_names: bool,
+    release_gil: bool,
+) -> PyResult<PyDataFrame> {
+    let parse = || match &schema {
+        None => read_rpsl_from_slice(data, layout, categorical_names),
+        Some(schema_df) => read_rpsl_with_schema_from_slice(data, schema_df.0.schema()),
+    };
+    let df = if release_gil {
+        py.detach(parse)
+    } else {
+        parse()
+    };
+    Ok(PyDataFrame(df.map_err(to_py_err)?))
+}
+
+/// Whether the memory behind a buffer can never be written while it is
+/// exported: it belongs to a `bytes` object or a read-only mmap.
+///
+/// The `readonly` flag of the buffer itself is not enough, as it only covers
+/// one view: a read-only memoryview of a bytearray, for instance, does not
+/// stop the bytearray, or another view of it, from being written.
+fn has_immutable_owner(data: &Bound<'_, PyAny>) -> PyResult<bool> {
+    let py = data.py();
+    let owner = if data.is_instance_of::<PyMemoryView>() {
+        data.getattr(intern!(py, "obj"))?
+    } else {
+        data.clone()
+    };
+
+    if owner.is_instance_of::<PyBytes>() {
+        return Ok(true);
+    }
+    let mmap = py
+        .import(intern!(py, "mmap"))?
+        .getattr(intern!(py, "mmap"))?;
+    if owner.is_instance(&mmap)? {
+        // An mmap opened with ACCESS_READ only ever exports read-only buffers
+        return Ok(PyBuffer::<u8>::get(&owner)?.readonly());
+    }
+    Ok(false)
+}
+
+/// Read from any object exporting a contiguous byte buffer (bytes, bytearray,
+/// memoryview, mmap, ...) in place, without copying it.
+#[pyfunction]
+#[pyo3(name = "read_rpsl_bytes", signature = (data, schema=None, layout="aos", categorical_names=false))]
+fn py_read_rpsl_bytes(
+    py: Python<'_>,
+    data: Bound<'_, PyAny>,
+    schema: Option<PyDataFrame>,
+    layout: &str,
+    categorical_names: bool,
+) -> PyResult<PyDataFrame> {
+    let buffer = PyBuffer::<u8>::get(&data)?;
+    if !buffer.is_c_contiguous() {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+            "buffer must be C-contiguous",
+        ));
     }
+    let layout = parse_layout(layout)?;
+
+    // Exporting a writable buffer only stops it from being resized, so the GIL
+    // is released only if nothing can write to the buffer meanwhile
+    let release_gil = has_immutable_owner(&data)?;
+
+    // SAFETY: the buffer is contiguous and stays exported (and thus cannot be
+    // resized or freed) for as long as `buffer` is alive. It is not written to
+    // while borrowed: either its owner is immutable, or the GIL stays held so
+    // no Python code runs until the parse is done.
+    let bytes =
+        unsafe { std::slice::from_raw_parts(buffer.buf_ptr() as *const u8, buffer.len_bytes()) };
+    slice_to_py(py, bytes, schema, layout, categorical_names, release_gil)
+}
+
+/// Read from an open regular file, starting at `offset`.
+///
+/// The descriptor is duplicated, so the caller keeps ownership of `fd`.
+#[cfg(unix)]
+#[pyfunction]
+#[pyo3(name = "read_rpsl_fd", signature = (fd, offset=0, schema=None, layout="aos", categorical_names=false))]
+fn py_read_rpsl_fd(
+    py: Python<'_>,
+    fd: RawFd,
+    offset: usize,
+    schema: Option<PyDataFrame>,
+    layout: &str,
+    categorical_names: bool,
+) -> PyResult<PyDataFrame> {
+    // SAFETY: the caller guarantees `fd` stays open for the duration of the call
+    let file = File::from(
+        unsafe { BorrowedFd::borrow_raw(fd) }
+            .try_clone_to_owned()
+            .map_err(to_py_err)?,
+    );
+    let len = file.metadata().map_err(to_py_err)?.len();
+    let mmap = map_file(&file, len).map_err(to_py_err)?;
+    slice_to_py(
+        py,
+        mmap.get(offset..).unwrap_or_default(),
+        schema,
+        parse_layout(layout)?,
+        categorical_names,
+        true,
+    )
+}
+
+/// Read from a Python binary file-like object that implements `readinto()`.
+///
+/// The GIL is released while parsing and only re-acquired to pull each chunk.
+#[pyfunction]
+#[pyo3(name = "read_rpsl_reader", signature = (source, schema=None, layout="aos", categorical_names=false))]
+fn py_read_rpsl_reader(
+    py: Python<'_>,
+    source: Bound<'_, PyAny>,
+    schema: Option<PyDataFrame>,
+    layout: &str,
+    categorical_names: bool,
+) -> PyResult<PyDataFrame> {
+    let mut reader = PyReader::new(source)?;
+    let layout = parse_layout(layout)?;
+    py.detach(|| read_to_py(&mut reader, schema, layout, categorical_names))
+        // Re-raise an exception from readinto() rather than wrapping it
+        .map_err(|err| reader.take_error().unwrap_or(err))
 }
 
 #[pymodule]
 fn _rpsl_reader(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(py_read_rpsl, m)?)?;
     m.add_function(wrap_pyfunction!(py_read_rpsl_bytes, m)?)?;
+    #[cfg(unix)]
+    m.add_function(wrap_pyfunction!(py_read_rpsl_fd, m)?)?;
+    m.add_function(wrap_pyfunction!(py_read_rpsl_reader, m)?)?;
     Ok(())
 }
@@ -0,0 +1,109 @@
+/// Maps attribute names to dense ids, assigned in insertion order.
+///
+/// RPSL attribute names are short and come from a small vocabulary, so rather
+/// than hashing every name, entries are bucketed by length and matched on a
+/// precomputed little-endian word of their first 8 bytes. Names of up to 8
+/// bytes are resolved with a single integer compare; longer names fall back to
+/// comparing the remaining bytes.
+pub(crate) struct NameIndex {
+    buckets: Vec<Vec<Entry>>,
+    len: usize,
+}
+
+struct Entry {
+    prefix: u64,
+    name: Box<[u8]>,
+    id: u32,
+}
+
+impl NameIndex {
+    pub fn new() -> Self {
+        Self {
+            buckets: Vec::new(),
+            len: 0,
+        }
+    }
+
+    /// Look up the id of `name`, if present
+    #[inline]
+    pub fn get(&self, name: &[u8]) -> Option<u32> {
+        let bucket = self.buckets.get(name.len())?;
+        let prefix = prefix(name);
+        bucket
+            .iter()
+            .find(|e| e.prefix == prefix && (name.len() <= 8 || e.name[8..] == name[8..]))
+            .map(|e| e.id)
+    }
+
+    /// Return the id of `name`, adding it to the index if it is not present
+    pub fn insert(&mut self, name: &[u8]) -> u32 {
+        if let Some(id) = self.get(name) {
+            return id;
+        }
+
+        if self.buckets.len() <= name.len() {
+            self.buckets.resize_with(name.len() + 1, Vec::new);
+        }
+
+        let id = self.len as u32;
+        self.buckets[name.len()].push(Entry {
+            prefix: prefix(name),
+            name: name.into(),
+            id,
+        });
+        self.len += 1;
+        id
+    }
+}
+
+#[inline]
+fn prefix(name: &[u8]) -> u64 {
+    let mut word = [0u8; 8];
+    let n = name.len().min(8);
+    word[..n].copy_from_slice(&name[..n]);
+    u64::from_le_bytes(word)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_long_names_sharing_prefix() {
+        let mut index = NameIndex::new();
+        let routes = index.insert(b"mnt-routes");
+        let routex = index.insert(b"mnt-routex");
+
+        assert_ne!(routes, routex);
+        assert_eq!(index.get(b"mnt-routes"), Some(routes));
+        assert_eq!(index.get(b"mnt-routex"), Some(routex));
+        assert_eq!(index.insert(b"mnt-routex"), routex);
+    }
+
+    #[test]
+    fn test_names_with_different_prefixes() {
+        let mut index = NameIndex::new();
+        let import = index.insert(b"mp-import");
+        let export = index.insert(b"mp-export");
+
+        assert_ne!(import, export);
+        assert_eq!(index.get(b"mp-import"), Some(import));
+        assert_eq!(index.get(b"mp-export"), Some(export));
+    }
+
+    #[test]
+    fn test_unknown_names() {
+        let mut index = NameIndex::new();
+        index.insert(b"aut-num");
+        index.insert(b"mnt-routes");
+
+        // Same lengths as known names, but different bytes
+        assert_eq!(index.get(b"aut-nux"), None);
+        assert_eq!(index.get(b"mnt-routez"), None);
+        assert_eq!(index.get(b"xnt-routes"), None);
+        // Lengths with no bucket, or beyond all buckets
+        assert_eq!(index.get(b"route"), None);
+        assert_eq!(index.get(b"mnt-routes-extra"), None);
+        assert_eq!(index.get(b""), None);
+    }
+}
@@ -0,0 +1,121 @@
+use std::ops::Range;
+
+use polars::frame::DataFrame;
+use rayon::prelude::*;
+use rpsl_parser::{Callbacks, ParseError, RpslParser};
+
+use crate::RpslError;
+
+/// Smallest chunk worth handing to a separate thread
+const MIN_CHUNK_LEN: usize = 1 << 20;
+
+/// Parse in-memory RPSL data, splitting it on object boundaries and parsing
+/// the pieces in parallel.
+///
+/// Each chunk gets its own builder from `new`, and the resulting DataFrames
+/// are concatenated in input order. Line and row numbers in errors refer to
+/// the whole input, and the first error in input order is returned. As when
+/// parsing sequentially, nothing after an `EOF` literal is part of the
+/// result: later chunks are dropped, along with any errors they hit.
+pub(crate) fn parse_slice<C, N, B>(data: &[u8], new: N, build: B) -> Result<DataFrame, RpslError>
+where
+    C: Callbacks,
+    N: Fn() -> Result<C, RpslError> + Sync,
+    B: Fn(C) -> Result<DataFrame, RpslError> + Sync,
+{
+    // Each chunk also reports whether it stopped at an EOF literal
+    let parse_chunk = |chunk: &[u8]| {
+        let mut parser = RpslParser::new(new()?);
+        parser.parse_slice(chunk)?;
+        let eof_marker = parser.reached_eof_marker();
+        Ok((build(parser.into_callbacks())?, eof_marker))
+    };
+
+    let chunks = split_chunks(data, rayon::current_num_threads());
+    if chunks.len() == 1 {
+        return parse_chunk(data).map(|(df, _)| df);
+    }
+
+    let results: Vec<_> = chunks
+        .par_iter()
+        .map(|range| parse_chunk(&data[range.clone()]))
+        .collect();
+
+    let mut rows = 0;
+    let mut frames = Vec::with_capacity(chunks.len());
+    for (range, result) in chunks.iter().zip(results) {
+        let (df, eof_marker) = result.map_err(|e| offset_error(e, &data[..range.start], rows))?;
+        rows += df.height();
+        frames.push(df);
+        if eof_marker {
+            break;
+        }
+    }
+
+    let mut frames = frames.into_iter();
+    let mut out = frames.next().expect("at least one chunk");
+    for df in frames {
+        out.vstack_mut(&df)
+            .expect("Failed to concatenate DataFrames");
+    }
+    Ok(out)
+}
+
+/// Split `data` into at most `n` ranges that each end just before a blank
+/// line, so that no object spans two ranges.
+fn split_chunks(data: &[u8], n: usize) -> Vec<Range<usize>> {
+    let n = n.min(data.len() / MIN_CHUNK_LEN).max(1);
+    let target = data.len() / n;
+
+    let mut chunks = Vec::with_capacity(n);
+    let mut start = 0;
+    while chunks.len() + 1 < n {
+        let Some(end) = next_boundary(data, start + target) else {
+            break;
+        };
+        chunks.push(start..end);
+        start = end;
+    }
+    chunks.push(start..data.len());
+    chunks
+}
+
+/// Find the first position at or after `from` that starts a blank line
+fn next_boundary(data: &[u8], from: usize) -> Option<usize> {
+    let mut pos = from;
+    while pos < data.len() {
+        let newline = pos + memchr::memchr(b'\n', &data[pos..])?;
+        let next = &data[newline + 1..];
+        if next.starts_with(b"\n") || next.starts_with(b"\r\n") {
+            return Some(newline + 1);
+        }
+        pos = newline + 1;
+    }
+    None
+}
+
+/// Rebase line and row numbers from a chunk-relative error onto the whole input
+fn offset_error(err: RpslError, preceding: &[u8], rows: usize) -> RpslError {
+    let lines = || memchr::memchr_iter(b'\n', preceding).count() as u32;
+    match err {
+        RpslError::Parse(ParseError::InvalidSyntax {
+            line_number,
+            message,
+            line,
+        }) => RpslError::Parse(ParseError::InvalidSyntax {
+            line_number: line_number + lines(),
+            message,
+            line,
+        }),
+        RpslError::Parse(ParseError::UnexpectedEof { line_number }) => {
+            RpslError::Parse(ParseError::UnexpectedEof {
+                line_number: line_number + lines(),
+            })
+        }
+        RpslError::DuplicateSingleValue { attr, row } => RpslError::DuplicateSingleValue {
+            attr,
+            row: row + rows,
+        },
+        err => err,
+    }
+}
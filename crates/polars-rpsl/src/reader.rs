@@ -0,0 +1,94 @@
+use std::io::{self, BufRead, Read};
+
+use pyo3::intern;
+use pyo3::prelude::*;
+use pyo3::types::PyByteArray;
+
+/// Size of each `readinto()` call made against the Python object
+const CHUNK_SIZE: usize = 1 << 20;
+
+/// Buffered reader over a Python binary file-like object.
+///
+/// Data is pulled in fixed-size chunks via `readinto()` into a reusable
+/// `bytearray`, so the stream is never materialized in full on either side.
+/// The reader does not need the GIL to be held: it is acquired only for the
+/// duration of each `readinto()` call, so parsing can run with it released.
+///
+/// An exception raised by `readinto()` is kept as is, so that it can be
+/// re-raised unchanged once parsing has failed (see `take_error`).
+pub(crate) struct PyReader {
+    source: Py<PyAny>,
+    chunk: Py<PyByteArray>,
+    buf: Vec<u8>,
+    pos: usize,
+    error: Option<PyErr>,
+}
+
+impl PyReader {
+    pub fn new(source: Bound<'_, PyAny>) -> PyResult<Self> {
+        let chunk = PyByteArray::new_with(source.py(), CHUNK_SIZE, |_| Ok(()))?;
+        Ok(Self {
+            source: source.unbind(),
+            chunk: chunk.unbind(),
+            buf: Vec::new(),
+            pos: 0,
+            error: None,
+        })
+    }
+
+    /// Take the exception raised by `readinto()`, if reading failed
+    pub fn take_error(&mut self) -> Option<PyErr> {
+        self.error.take()
+    }
+
+    fn read_chunk(&mut self) -> PyResult<()> {
+        Python::attach(|py| {
+            let chunk = self.chunk.bind(py);
+            let n = self
+                .source
+                .bind(py)
+                .call_method1(intern!(py, "readinto"), (chunk,))?
+                .extract::<Option<usize>>()?
+                .ok_or_else(|| {
+                    PyErr::new::<pyo3::exceptions::PyBlockingIOError, _>(
+                        "file-like object has no data available (non-blocking stream)",
+                    )
+                })?;
+
+            self.buf.clear();
+            // SAFETY: the GIL is held and no Python code runs while we copy out
+            // of the bytearray, so it cannot be resized or mutated underneath us.
+            let bytes = unsafe { chunk.as_bytes() };
+            self.buf.extend_from_slice(&bytes[..n.min(bytes.len())]);
+            self.pos = 0;
+            Ok(())
+        })
+    }
+}
+
+impl Read for PyReader {
+    fn read(&mut self, out: &mut [u8]) -> io::Result<usize> {
+        let available = self.fill_buf()?;
+        let n = available.len().min(out.len());
+        out[..n].copy_from_slice(&available[..n]);
+        self.consume(n);
+        Ok(n)
+    }
+}
+
+impl BufRead for PyReader {
+    fn fill_buf(&mut self) -> io::Result<&[u8]> {
+        if self.pos >= self.buf.len() {
+            if let Err(err) = self.read_chunk() {
+                let io_err = io::Error::other(err.to_string());
+                self.error = Some(err);
+                return Err(io_err);
+            }
+        }
+        Ok(&self.buf[self.pos..])
+    }
+
+    fn consume(&mut self, amt: usize) {
+        self.pos = (self.pos + amt).min(self.buf.len());
+    }
+}
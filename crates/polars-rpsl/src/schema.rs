@@ -1,6 +1,3 @@
-use std::collections::HashMap;
-
-use indexmap::IndexMap;
 use polars::{
     frame::DataFrame,
     prelude::{ArrowField, DataType, LargeListArray, Schema, Series},
@@ -13,25 +10,47 @@ use polars_arrow::{
 use rpsl_parser::Callbacks;
 
 use crate::RpslError;
+use crate::names::NameIndex;
+
+/// What to do with an attribute, precomputed per schema attribute name
+#[derive(Clone, Copy, PartialEq)]
+enum AttrAction {
+    /// Not in the schema
+    Skip,
+
+    /// Set the value of the String column with this index in `strings`
+    String(u32),
 
-#[derive(Debug, Clone, Copy, PartialEq)]
-enum ColumnType {
-    String,
-    ListString,
+    /// Append to the List[String] column with this index in `lists`
+    List(u32),
 }
 
 pub(crate) struct SchemaPolarsBuilder {
-    /// Column names in schema order
-    columns: IndexMap<String, ColumnType>,
+    /// Column names in schema order, with the action that fills each column
+    columns: Vec<(String, AttrAction)>,
 
     /// Builders for String columns
-    string_builders: HashMap<String, MutableUtf8Array<i64>>,
+    strings: Vec<MutableUtf8Array<i64>>,
 
     /// Builders for List[String] columns (values array + offsets)
-    list_builders: HashMap<String, (MutableUtf8Array<i64>, Vec<i64>)>,
+    lists: Vec<(MutableUtf8Array<i64>, Vec<i64>)>,
+
+    /// Id of each schema attribute name, indexing `actions`
+    names: NameIndex,
+
+    /// Action for each attribute name id
+    actions: Vec<AttrAction>,
+
+    /// Most recently looked up attribute name and its action. Names tend to
+    /// repeat in runs (`mnt-by`, `member-of`, ...), so this usually saves the
+    /// index lookup.
+    last_name: Vec<u8>,
+    last_action: AttrAction,
 
-    /// Current object's accumulated values
-    current_object: HashMap<String, Vec<String>>,
+    /// Bitset of the String columns that already have a value in the current
+    /// object. Values are written straight into the column builders as they
+    /// are parsed, so no per-object copy of them is kept.
+    seen: Vec<u64>,
 
     /// Current row number (for error reporting)
     row_count: usize,
@@ -42,15 +61,21 @@ pub(crate) struct SchemaPolarsBuilder {
 
 impl SchemaPolarsBuilder {
     pub fn new(schema: &Schema) -> Result<Self, RpslError> {
-        let mut columns = IndexMap::new();
-        let mut string_builders = HashMap::new();
-        let mut list_builders = HashMap::new();
+        let mut columns = Vec::new();
+        let mut strings = Vec::new();
+        let mut lists = Vec::new();
+        let mut names = NameIndex::new();
+        let mut actions = Vec::new();
 
         for (name, dtype) in schema.iter() {
-            let col_type = match dtype {
-                DataType::String => ColumnType::String,
+            let action = match dtype {
+                DataType::String => {
+                    strings.push(MutableUtf8Array::<i64>::new());
+                    AttrAction::String(strings.len() as u32 - 1)
+                }
                 DataType::List(inner) if matches!(inner.as_ref(), DataType::String) => {
-                    ColumnType::ListString
+                    lists.push((MutableUtf8Array::<i64>::new(), vec![0i64]));
+                    AttrAction::List(lists.len() as u32 - 1)
                 }
                 _ => {
                     return Err(RpslError::UnsupportedType {
@@ -60,26 +85,22 @@ impl SchemaPolarsBuilder {
                 }
             };
 
-            columns.insert(name.to_string(), col_type);
-
-            match col_type {
-                ColumnType::String => {
-                    string_builders.insert(name.to_string(), MutableUtf8Array::<i64>::new());
-                }
-                ColumnType::ListString => {
-                    list_builders.insert(
-                        name.to_string(),
-                        (MutableUtf8Array::<i64>::new(), vec![0i64]),
-                    );
-                }
+            columns.push((name.to_string(), action));
+            let id = names.insert(name.as_bytes()) as usize;
+            if id == actions.len() {
+                actions.push(action);
             }
         }
 
         Ok(Self {
+            seen: vec![0; strings.len().div_ceil(64)],
             columns,
-            string_builders,
-            list_builders,
-            current_object: HashMap::new(),
+            strings,
+            lists,
+            names,
+            actions,
+            last_name: Vec::new(),
+            last_action: AttrAction::Skip,
             row_count: 0,
             error: None,
         })
@@ -90,18 +111,22 @@ impl SchemaPolarsBuilder {
             return Err(err);
         }
 
+        let mut strings = self.strings.into_iter();
+        let mut lists = self.lists.into_iter();
         let mut series_vec = Vec::new();
 
-        for (name, col_type) in &self.columns {
-            let series = match col_type {
-                ColumnType::String => {
-                    let array = self.string_builders.get(name).unwrap().clone();
+        // Builders are taken in the order their actions were assigned, which
+        // is schema order within each kind
+        for (name, action) in self.columns {
+            let series = match action {
+                AttrAction::String(_) => {
+                    let array = strings.next().expect("String column builder");
                     let utf8_array: polars_arrow::array::Utf8Array<i64> = array.into();
                     Series::from_arrow(name.as_str().into(), Box::new(utf8_array))
                         .expect("Failed to create string series")
                 }
-                ColumnType::ListString => {
-                    let (values_array, offsets) = self.list_builders.get(name).unwrap().clone();
+                AttrAction::List(_) => {
+                    let (values_array, offsets) = lists.next().expect("List column builder");
                     let utf8_array: polars_arrow::array::Utf8Array<i64> = values_array.into();
 
                     let offsets_buffer = unsafe { OffsetsBuffer::new_unchecked(offsets.into()) };
@@ -119,33 +144,65 @@ impl SchemaPolarsBuilder {
                     Series::from_arrow(name.as_str().into(), Box::new(list_array))
                         .expect("Failed to create list series")
                 }
+                AttrAction::Skip => unreachable!("schema columns always have a builder"),
             };
             series_vec.push(series.into());
         }
 
         Ok(DataFrame::new(series_vec).expect("Failed to create DataFrame"))
     }
+
+    /// Record a second value for the String column `col` in the current object
+    #[cold]
+    fn duplicate_value(&mut self, col: u32) {
+        let attr = self
+            .columns
+            .iter()
+            .find(|(_, action)| *action == AttrAction::String(col))
+            .map(|(name, _)| name.clone())
+            .unwrap_or_default();
+        self.error = Some(RpslError::DuplicateSingleValue {
+            attr,
+            row: self.row_count,
+        });
+    }
 }
 
 impl Callbacks for SchemaPolarsBuilder {
-    fn start_object(&mut self) {
-        self.current_object.clear();
-    }
+    fn start_object(&mut self) {}
 
     fn attribute(&mut self, name: &[u8], value: &[u8]) {
         if self.error.is_some() {
             return;
         }
 
-        let name_str = String::from_utf8_lossy(name).to_string();
-        let value_str = String::from_utf8_lossy(value).to_string();
+        // Only collect attributes that are in the schema, and check before
+        // converting anything for the value
+        if name != self.last_name.as_slice() {
+            self.last_name.clear();
+            self.last_name.extend_from_slice(name);
+            self.last_action = match self.names.get(name) {
+                Some(id) => self.actions[id as usize],
+                None => AttrAction::Skip,
+            };
+        }
 
-        // Only collect attributes that are in the schema
-        if self.columns.contains_key(&name_str) {
-            self.current_object
-                .entry(name_str)
-                .or_insert_with(Vec::new)
-                .push(value_str);
+        match self.last_action {
+            AttrAction::Skip => {}
+            AttrAction::String(col) => {
+                let (word, bit) = (col as usize / 64, 1u64 << (col % 64));
+                if self.seen[word] & bit != 0 {
+                    self.duplicate_value(col);
+                    return;
+                }
+                self.seen[word] |= bit;
+                self.strings[col as usize].push(Some(String::from_utf8_lossy(value)));
+            }
+            AttrAction::List(col) => {
+                self.lists[col as usize]
+                    .0
+                    .push(Some(String::from_utf8_lossy(value)));
+            }
         }
     }
 
@@ -154,47 +211,17 @@ impl Callbacks for SchemaPolarsBuilder {
             return;
         }
 
-        // Process each column in schema order
-        for (name, col_type) in &self.columns {
-            let values = self.current_object.get(name);
-
-            match col_type {
-                ColumnType::String => {
-                    let builder = self.string_builders.get_mut(name).unwrap();
-                    match values {
-                        None => builder.push::<&str>(None),
-                        Some(vals) if vals.is_empty() => builder.push::<&str>(None),
-                        Some(vals) if vals.len() == 1 => builder.push(Some(&vals[0])),
-                        Some(_) => {
-                            self.error = Some(RpslError::DuplicateSingleValue {
-                                attr: name.clone(),
-                                row: self.row_count,
-                            });
-                            return;
-                        }
-                    }
-                }
-                ColumnType::ListString => {
-                    let (values_builder, offsets) = self.list_builders.get_mut(name).unwrap();
-                    match values {
-                        None => {
-                            // Empty list - just update offset
-                            offsets.push(values_builder.len() as i64);
-                        }
-                        Some(vals) if vals.is_empty() => {
-                            // Empty list - just update offset
-                            offsets.push(values_builder.len() as i64);
-                        }
-                        Some(vals) => {
-                            for val in vals {
-                                values_builder.push(Some(val.as_str()));
-                            }
-                            offsets.push(values_builder.len() as i64);
-                        }
-                    }
-                }
+        // Close off each column for this row
+        for (col, builder) in self.strings.iter_mut().enumerate() {
+            if self.seen[col / 64] & (1u64 << (col % 64)) == 0 {
+                builder.push::<&str>(None);
             }
         }
+        self.seen.fill(0);
+
+        for (values_builder, offsets) in &mut self.lists {
+            offsets.push(values_builder.len() as i64);
+        }
 
         self.row_count += 1;
     }
@@ -3,53 +3,135 @@ use polars::{
     prelude::{ArrowField, LargeListArray, Series},
 };
 use polars_arrow::{
-    array::{Array, MutableUtf8Array, StructArray},
+    array::{Array, DictionaryArray, MutableUtf8Array, PrimitiveArray, StructArray},
     datatypes::ArrowDataType,
     offset::OffsetsBuffer,
 };
 use rpsl_parser::Callbacks;
 
+use crate::names::NameIndex;
+
+/// Output layout for schema-less reading
+#[derive(Debug, Clone, Copy, Default, PartialEq)]
+pub enum Layout {
+    /// A single `attributes` column of `List[Struct{name, value}]`
+    #[default]
+    Aos,
+    /// Two `List[String]` columns, `names` and `values`, sharing one offsets buffer
+    Soa,
+}
+
+/// Builder for the attribute name array
+enum NamesBuilder {
+    /// Every name stored as a string
+    String(MutableUtf8Array<i32>),
+
+    /// Names dictionary-encoded as `Categorical`: one id per attribute, and
+    /// each distinct name stored once
+    Categorical {
+        index: NameIndex,
+        ids: Vec<u32>,
+        categories: MutableUtf8Array<i32>,
+    },
+}
+
+impl NamesBuilder {
+    fn push(&mut self, name: &[u8]) {
+        match self {
+            NamesBuilder::String(names) => {
+                names.push(Some(String::from_utf8_lossy(name).as_ref()));
+            }
+            NamesBuilder::Categorical {
+                index,
+                ids,
+                categories,
+            } => {
+                let id = index.insert(name);
+                if id as usize == categories.len() {
+                    categories.push(Some(String::from_utf8_lossy(name).as_ref()));
+                }
+                ids.push(id);
+            }
+        }
+    }
+
+    fn finish(self) -> Box<dyn Array> {
+        match self {
+            NamesBuilder::String(names) => {
+                let names: polars_arrow::array::Utf8Array<i32> = names.into();
+                Box::new(names)
+            }
+            NamesBuilder::Categorical {
+                ids, categories, ..
+            } => {
+                let categories: polars_arrow::array::Utf8Array<i32> = categories.into();
+                let names = DictionaryArray::try_from_keys(
+                    PrimitiveArray::from_vec(ids),
+                    Box::new(categories),
+                )
+                .expect("Failed to create dictionary array");
+                Box::new(names)
+            }
+        }
+    }
+}
+
 pub(crate) struct PolarsBuilder {
-    names: MutableUtf8Array<i32>,
+    layout: Layout,
+    names: NamesBuilder,
     values: MutableUtf8Array<i64>,
     object_starts: Vec<i64>,
 }
 
 impl PolarsBuilder {
-    pub fn new() -> PolarsBuilder {
+    pub fn new(layout: Layout, categorical_names: bool) -> PolarsBuilder {
+        let names = if categorical_names {
+            NamesBuilder::Categorical {
+                index: NameIndex::new(),
+                ids: Vec::new(),
+                categories: MutableUtf8Array::<i32>::new(),
+            }
+        } else {
+            NamesBuilder::String(MutableUtf8Array::<i32>::new())
+        };
+
         PolarsBuilder {
-            names: MutableUtf8Array::<i32>::new(),
+            layout,
+            names,
             values: MutableUtf8Array::<i64>::new(),
             object_starts: vec![0],
         }
     }
 
     pub fn build(self) -> DataFrame {
-        let names_array: polars_arrow::array::Utf8Array<i32> = self.names.into();
+        let names_array = self.names.finish();
         let values_array: polars_arrow::array::Utf8Array<i64> = self.values.into();
+        let offsets = unsafe { OffsetsBuffer::new_unchecked(self.object_starts.into()) };
+
+        if self.layout == Layout::Soa {
+            let names = large_list(names_array, offsets.clone());
+            let values = large_list(Box::new(values_array), offsets);
+
+            let names = Series::from_arrow("names".into(), Box::new(names))
+                .expect("Failed to create list series");
+            let values = Series::from_arrow("values".into(), Box::new(values))
+                .expect("Failed to create list series");
+
+            return DataFrame::new(vec![names.into(), values.into()])
+                .expect("Failed to create DataFrame");
+        }
 
         let struct_fields = vec![
-            ArrowField::new("name".into(), ArrowDataType::Utf8, false),
+            ArrowField::new("name".into(), names_array.dtype().clone(), false),
             ArrowField::new("value".into(), ArrowDataType::LargeUtf8, false),
         ];
         let struct_array = StructArray::new(
             ArrowDataType::Struct(struct_fields),
-            names_array.len(),
-            vec![Box::new(names_array), Box::new(values_array)],
-            None,
-        );
-
-        let offsets = unsafe { OffsetsBuffer::new_unchecked(self.object_starts.into()) };
-        let list_array = LargeListArray::new(
-            ArrowDataType::LargeList(Box::new(ArrowField::new(
-                "item".into(),
-                struct_array.dtype().clone(),
-                true,
-            ))),
-            offsets,
-            Box::new(struct_array),
+            values_array.len(),
+            vec![names_array, Box::new(values_array)],
             None,
         );
+        let list_array = large_list(Box::new(struct_array), offsets);
 
         let series = Series::from_arrow("attributes".into(), Box::new(list_array))
             .expect("Failed to create list series");
@@ -58,17 +140,29 @@ impl PolarsBuilder {
     }
 }
 
+fn large_list(values: Box<dyn Array>, offsets: OffsetsBuffer<i64>) -> LargeListArray {
+    LargeListArray::new(
+        ArrowDataType::LargeList(Box::new(ArrowField::new(
+            "item".into(),
+            values.dtype().clone(),
+            true,
+        ))),
+        offsets,
+        values,
+        None,
+    )
+}
+
 impl Callbacks for PolarsBuilder {
     fn start_object(&mut self) {}
 
     fn attribute(&mut self, name: &[u8], value: &[u8]) {
-        self.names
-            .push(Some(String::from_utf8_lossy(name).as_ref()));
+        self.names.push(name);
         self.values
             .push(Some(String::from_utf8_lossy(value).as_ref()));
     }
 
     fn end_object(&mut self) {
-        self.object_starts.push(self.names.len() as i64);
+        self.object_starts.push(self.values.len() as i64);
     }
 }
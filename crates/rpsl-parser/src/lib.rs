@@ -47,6 +47,7 @@ impl Callbacks for Printer {
 /// RPSL Parser
 pub struct RpslParser<C> {
     callbacks: C,
+    eof_marker: bool,
 }
 
 #[derive(Error, Debug)]
@@ -67,23 +68,47 @@ pub enum ParseError {
 
 impl<C: Callbacks> RpslParser<C> {
     pub fn new(callbacks: C) -> Self {
-        Self { callbacks }
+        Self {
+            callbacks,
+            eof_marker: false,
+        }
     }
 
     pub fn into_callbacks(self) -> C {
         self.callbacks
     }
 
-    pub fn parse<R: BufRead>(&mut self, mut reader: R) -> Result<(), ParseError> {
+    /// Whether the last parse stopped at an `EOF` literal (as found in APNIC
+    /// files) rather than at the end of the input
+    pub fn reached_eof_marker(&self) -> bool {
+        self.eof_marker
+    }
+
+    /// Parse RPSL data from a buffered reader
+    pub fn parse<R: BufRead>(&mut self, reader: R) -> Result<(), ParseError> {
+        self.parse_lines(ReaderLines(reader))
+    }
+
+    /// Parse RPSL data held in memory.
+    ///
+    /// Lines are located with `memchr` and passed to the callbacks directly
+    /// from `data`, without being copied into an intermediate buffer.
+    pub fn parse_slice(&mut self, data: &[u8]) -> Result<(), ParseError> {
+        self.parse_lines(SliceLines(data))
+    }
+
+    fn parse_lines<'d, L: LineSource<'d>>(&mut self, mut lines: L) -> Result<(), ParseError> {
         let mut buf = Vec::with_capacity(8192);
         let mut cont_buf = Vec::with_capacity(8192);
+        let mut accumulated = Vec::with_capacity(512);
         let mut in_object = false;
         let mut line_number = 0;
+        self.eof_marker = false;
 
         loop {
             buf.clear();
 
-            let Some(line) = Self::read_line(&mut reader, &mut buf)? else {
+            let Some(line) = lines.read_line(&mut buf)? else {
                 if in_object {
                     self.callbacks.end_object();
                 }
@@ -114,6 +139,10 @@ impl<C: Callbacks> RpslParser<C> {
             let Some(colon_pos) = memchr::memchr(b':', clean_line) else {
                 // Handle special EOF literal found in APNIC files
                 if clean_line == [b'E', b'O', b'F'] {
+                    if in_object {
+                        self.callbacks.end_object();
+                    }
+                    self.eof_marker = true;
                     return Ok(());
                 }
 
@@ -140,15 +169,15 @@ impl<C: Callbacks> RpslParser<C> {
             let attr_name = &clean_line[0..colon_pos];
             let attr_value = &clean_line[colon_pos + 1..];
 
-            if !Self::next_is_continuation(&mut reader)? {
+            if !Self::next_is_continuation(&mut lines)? {
                 self.callbacks.attribute(attr_name, Self::trim(attr_value));
             } else {
-                let mut accumulated = Vec::with_capacity(512);
+                accumulated.clear();
                 accumulated.extend_from_slice(Self::trim(attr_value));
 
                 loop {
                     cont_buf.clear();
-                    let Some(cont_line) = Self::read_line(&mut reader, &mut cont_buf)? else {
+                    let Some(cont_line) = lines.read_line(&mut cont_buf)? else {
                         break;
                     };
                     line_number += 1;
@@ -160,7 +189,7 @@ impl<C: Callbacks> RpslParser<C> {
                         }
                     }
 
-                    if !Self::next_is_continuation(&mut reader)? {
+                    if !Self::next_is_continuation(&mut lines)? {
                         break;
                     }
                 }
@@ -171,8 +200,8 @@ impl<C: Callbacks> RpslParser<C> {
     }
 
     #[inline]
-    fn next_is_continuation<R: BufRead>(reader: &mut R) -> Result<bool, ParseError> {
-        match Self::peek(reader)? {
+    fn next_is_continuation<'d, L: LineSource<'d>>(lines: &mut L) -> Result<bool, ParseError> {
+        match lines.peek()? {
             Some(ch) => Ok(Self::is_continuation(ch)),
             _ => Ok(false),
         }
@@ -191,20 +220,36 @@ impl<C: Callbacks> RpslParser<C> {
         }
     }
 
-    #[inline]
-    fn peek<R: BufRead>(reader: &mut R) -> Result<Option<u8>, ParseError> {
-        match reader.fill_buf() {
-            Ok(buf) if buf.is_empty() => Ok(None),
-            Ok(buf) => Ok(Some(buf[0])),
-            Err(e) => Err(ParseError::Io(e)),
+    fn strip_comment(line: &[u8]) -> Option<&[u8]> {
+        match memchr::memchr2(b'%', b'#', line) {
+            None => Some(line),
+            Some(0) => None,
+            Some(n) => Some(&line[0..n]),
         }
     }
+}
 
-    fn read_line<'a, R: BufRead>(
-        reader: &mut R,
-        buf: &'a mut Vec<u8>,
-    ) -> Result<Option<&'a [u8]>, ParseError> {
-        match reader.read_until(b'\n', buf) {
+/// A source of input lines for the parser
+trait LineSource<'d> {
+    /// Read the next line, without its line terminator. The line is either
+    /// copied into `buf` or borrowed directly from the underlying data.
+    fn read_line<'a>(&mut self, buf: &'a mut Vec<u8>) -> Result<Option<&'a [u8]>, ParseError>
+    where
+        'd: 'a;
+
+    /// Peek at the first byte of the next line
+    fn peek(&mut self) -> Result<Option<u8>, ParseError>;
+}
+
+/// Lines read from a `BufRead`, copied into the caller's buffer
+struct ReaderLines<R>(R);
+
+impl<R: BufRead> LineSource<'static> for ReaderLines<R> {
+    fn read_line<'a>(&mut self, buf: &'a mut Vec<u8>) -> Result<Option<&'a [u8]>, ParseError>
+    where
+        'static: 'a,
+    {
+        match self.0.read_until(b'\n', buf) {
             Ok(0) => Ok(None),
             Ok(n) if n >= 2 && buf[n - 2] == b'\r' && buf[n - 1] == b'\n' => {
                 Ok(Some(&buf[0..n - 2]))
@@ -215,15 +260,48 @@ impl<C: Callbacks> RpslParser<C> {
         }
     }
 
-    fn strip_comment(line: &[u8]) -> Option<&[u8]> {
-        match memchr::memchr2(b'%', b'#', line) {
-            None => Some(line),
-            Some(0) => None,
-            Some(n) => Some(&line[0..n]),
+    #[inline]
+    fn peek(&mut self) -> Result<Option<u8>, ParseError> {
+        match self.0.fill_buf() {
+            Ok(buf) if buf.is_empty() => Ok(None),
+            Ok(buf) => Ok(Some(buf[0])),
+            Err(e) => Err(ParseError::Io(e)),
         }
     }
 }
 
+/// Lines borrowed from an in-memory buffer
+struct SliceLines<'d>(&'d [u8]);
+
+impl<'d> LineSource<'d> for SliceLines<'d> {
+    fn read_line<'a>(&mut self, _buf: &'a mut Vec<u8>) -> Result<Option<&'a [u8]>, ParseError>
+    where
+        'd: 'a,
+    {
+        let data = self.0;
+        if data.is_empty() {
+            return Ok(None);
+        }
+
+        match memchr::memchr(b'\n', data) {
+            Some(n) => {
+                self.0 = &data[n + 1..];
+                let line = &data[..n];
+                Ok(Some(line.strip_suffix(b"\r").unwrap_or(line)))
+            }
+            None => {
+                self.0 = &[];
+                Ok(Some(data)) // EOF without newline
+            }
+        }
+    }
+
+    #[inline]
+    fn peek(&mut self) -> Result<Option<u8>, ParseError> {
+        Ok(self.0.first().copied())
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -245,6 +323,88 @@ mod tests {
         parser.parse(&input[..]).unwrap();
     }
 
+    /// Records the objects completed during parsing
+    #[derive(Debug, Default, PartialEq)]
+    struct Recorder {
+        objects: Vec<Vec<(String, String)>>,
+        current: Vec<(String, String)>,
+    }
+
+    impl Callbacks for Recorder {
+        fn start_object(&mut self) {
+            self.current.clear();
+        }
+
+        fn attribute(&mut self, name: &[u8], value: &[u8]) {
+            self.current.push((
+                String::from_utf8_lossy(name).into(),
+                String::from_utf8_lossy(value).into(),
+            ));
+        }
+
+        fn end_object(&mut self) {
+            self.objects.push(std::mem::take(&mut self.current));
+        }
+    }
+
+    fn parse_both(input: &[u8]) -> Recorder {
+        let mut from_reader = RpslParser::new(Recorder::default());
+        from_reader.parse(input).unwrap();
+        let mut from_slice = RpslParser::new(Recorder::default());
+        from_slice.parse_slice(input).unwrap();
+
+        let from_reader = from_reader.into_callbacks();
+        assert_eq!(from_reader, from_slice.into_callbacks());
+        from_reader
+    }
+
+    #[test]
+    fn test_parse_slice_matches_reader() {
+        let input = b"% comment\r\n\
+            route: 192.0.2.0/24\r\n\
+            descr: first\r\n\
+            \x20      second\r\n\
+            +      third\r\n\
+            origin:AS65000\r\n\
+            \r\n\
+            \n\
+            aut-num: AS65001\n\
+            remarks: no final newline";
+
+        let objects = parse_both(input).objects;
+        assert_eq!(objects.len(), 2);
+        assert_eq!(objects[0][1], ("descr".into(), "first second third".into()));
+        assert_eq!(objects[0][2], ("origin".into(), "AS65000".into()));
+        assert_eq!(objects[1][1], ("remarks".into(), "no final newline".into()));
+    }
+
+    #[test]
+    fn test_parse_slice_errors() {
+        let input = b"route: 192.0.2.0/24\n\n  continuation\n";
+        let mut parser = RpslParser::new(Noop);
+        let err = parser.parse_slice(input).unwrap_err();
+        assert!(matches!(
+            err,
+            ParseError::InvalidSyntax { line_number: 3, .. }
+        ));
+    }
+
+    #[test]
+    fn test_parse_eof_literal_ends_object() {
+        let objects = parse_both(b"route: 192.0.2.0/24\nEOF\nroute: 198.51.100.0/24\n").objects;
+        assert_eq!(objects, vec![vec![("route".into(), "192.0.2.0/24".into())]]);
+    }
+
+    #[test]
+    fn test_reached_eof_marker() {
+        let mut parser = RpslParser::new(Noop);
+        parser.parse_slice(b"route: 192.0.2.0/24\n\nEOF\n").unwrap();
+        assert!(parser.reached_eof_marker());
+
+        parser.parse(&b"route: 192.0.2.0/24\n"[..]).unwrap();
+        assert!(!parser.reached_eof_marker());
+    }
+
     fn fixtures_dir() -> PathBuf {
         let mut path = PathBuf::from(env!("CARGO_MANIFEST_DIR"));
         path.push("fixtures");
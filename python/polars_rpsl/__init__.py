@@ -1,38 +1,197 @@
+import functools
+import io
+import mmap
+import os
+import stat
 from pathlib import Path
-from typing import IO, Union
+from typing import IO, Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple, Union
 
 import polars as pl
 
 # Import the Rust extension
 from polars_rpsl._rpsl_reader import read_rpsl as _read_rpsl_rs
 from polars_rpsl._rpsl_reader import read_rpsl_bytes as _read_rpsl_bytes_rs
+from polars_rpsl._rpsl_reader import read_rpsl_reader as _read_rpsl_reader_rs
+
+try:
+    from polars_rpsl._rpsl_reader import read_rpsl_fd as _read_rpsl_fd_rs
+except ImportError:  # Only available on Unix
+    _read_rpsl_fd_rs = None
+
+
+# Streams known to be smaller than this are read in a single read() call
+_SMALL_INPUT_SIZE = 1 << 20
+
+
+@functools.lru_cache(maxsize=32)
+def _schema_to_empty_df(schema_items: Tuple[Tuple[str, pl.DataType], ...]) -> pl.DataFrame:
+    """Build (once per distinct schema) the empty DataFrame used to pass a schema to Rust."""
+    return pl.DataFrame(schema=dict(schema_items))
+
+
+def _regular_file_fd(source: "IO[bytes]") -> Optional[int]:
+    """Return the file descriptor of source if it is backed by a regular file."""
+    if _read_rpsl_fd_rs is None or not isinstance(source, (io.FileIO, io.BufferedReader)):
+        return None
+    try:
+        fd = source.fileno()
+    except (OSError, ValueError):
+        return None
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        return None
+    return fd
+
+
+def _remaining_size(source: "IO[bytes]") -> Optional[int]:
+    """Return the number of bytes left to read from source, if it is cheap to determine.
+
+    Only streams over a regular file are measured, using fstat. Seeking to the end
+    is avoided: on compressed streams (gzip.GzipFile, bz2.BZ2File, ...) it would
+    decompress everything just to find the size.
+    """
+    if not isinstance(source, (io.FileIO, io.BufferedReader, io.BufferedRandom)):
+        return None
+    try:
+        st = os.fstat(source.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return max(st.st_size - source.tell(), 0)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_bytes_io(
+    source: io.BytesIO,
+    schema_arg: Optional[pl.DataFrame],
+    layout: str,
+    categorical_names: bool,
+) -> pl.DataFrame:
+    # Pass the unread part of the underlying buffer rather than a copy of it
+    pos = source.tell()
+    with source.getbuffer() as view, view[pos:] as tail:
+        df = _read_rpsl_bytes_rs(tail, schema_arg, layout, categorical_names)
+    source.seek(0, io.SEEK_END)
+    return df
+
+
+def _read_file_like(
+    source: "IO[bytes]",
+    schema_arg: Optional[pl.DataFrame],
+    layout: str,
+    categorical_names: bool,
+) -> pl.DataFrame:
+    fd = _regular_file_fd(source)
+    if fd is not None:
+        # Map the underlying file directly, starting at the current position
+        df = _read_rpsl_fd_rs(fd, source.tell(), schema_arg, layout, categorical_names)
+        source.seek(0, io.SEEK_END)
+        return df
+
+    if isinstance(source, io.BytesIO):
+        return _read_bytes_io(source, schema_arg, layout, categorical_names)
+
+    if hasattr(source, "readinto"):
+        size = _remaining_size(source)
+        if size is None or size >= _SMALL_INPUT_SIZE:
+            # Stream the object in chunks rather than reading it all into memory
+            return _read_rpsl_reader_rs(source, schema_arg, layout, categorical_names)
+
+    data = source.read()
+    if not isinstance(data, bytes):
+        raise TypeError(
+            f"file-like object must return bytes from read(), got {type(data).__name__}"
+        )
+    return _read_rpsl_bytes_rs(data, schema_arg, layout, categorical_names)
+
+
+def _read_path(
+    source: Union[str, Path],
+    schema_arg: Optional[pl.DataFrame],
+    layout: str,
+    categorical_names: bool,
+) -> pl.DataFrame:
+    return _read_rpsl_rs(str(source), schema_arg, layout, categorical_names)
+
+
+def _read_any(
+    source: Any, schema_arg: Optional[pl.DataFrame], layout: str, categorical_names: bool
+) -> pl.DataFrame:
+    """Read a source whose exact type is not in _DISPATCH (e.g. subclasses)."""
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return _read_rpsl_bytes_rs(source, schema_arg, layout, categorical_names)
+    elif hasattr(source, "read"):
+        return _read_file_like(source, schema_arg, layout, categorical_names)
+
+    try:
+        # Any other object exporting a byte buffer (e.g. a numpy uint8 array)
+        view = memoryview(source)
+    except TypeError:
+        # Assume it's a path
+        return _read_path(source, schema_arg, layout, categorical_names)
+    return _read_rpsl_bytes_rs(view, schema_arg, layout, categorical_names)
+
+
+# Readers for common source types, looked up by exact type
+_DISPATCH: Dict[type, Callable[[Any, Optional[pl.DataFrame], str, bool], pl.DataFrame]] = {
+    bytes: _read_rpsl_bytes_rs,
+    bytearray: _read_rpsl_bytes_rs,
+    memoryview: _read_rpsl_bytes_rs,
+    mmap.mmap: _read_rpsl_bytes_rs,
+    str: _read_rpsl_rs,
+    type(Path()): _read_path,
+    io.BufferedReader: _read_file_like,
+    io.FileIO: _read_file_like,
+    io.BytesIO: _read_bytes_io,
+}
 
 
 def read_rpsl(
-    source: Union[str, Path, bytes, "IO[bytes]"],
+    source: Union[str, Path, bytes, bytearray, memoryview, "IO[bytes]"],
     schema: Union[pl.Schema, pl.DataFrame, None] = None,
+    layout: Literal["aos", "soa"] = "aos",
+    categorical_names: bool = False,
 ) -> pl.DataFrame:
     """
-    Read RPSL data from a file, bytes, or binary file-like object into a Polars DataFrame.
+    Read RPSL data from a file, buffer, or binary file-like object into a Polars DataFrame.
 
     Parameters
     ----------
-    source : str, Path, bytes, or binary file-like object
+    source : str, Path, bytes-like, or binary file-like object
         Source of RPSL data. Can be:
-        - A file path (str or Path). Gzip-compressed files (.gz) are automatically detected.
-        - Raw bytes containing RPSL data.
+        - A file path (str or Path). Gzip-compressed files are detected from their content
+          and decompressed while they are parsed.
+        - Raw RPSL data in any object supporting the buffer protocol (bytes, bytearray,
+          memoryview, mmap.mmap, ...). The buffer is parsed in place without copying.
+          Immutable buffers (bytes, mmap opened with ACCESS_READ) are parsed with the
+          GIL released; writable ones keep it held, so that they cannot change while
+          being parsed.
         - A binary file-like object with a read() method (e.g., open(path, 'rb'), io.BytesIO).
+          Regular files are memory-mapped, io.BytesIO is parsed in place, and other
+          objects are read in one call if small or streamed in chunks via readinto()
+          when available. Reading starts at the current position.
     schema : pl.Schema, pl.DataFrame, or None, optional
         Schema to use for reading the data. If provided, the data will be read into
         columns matching the schema. Only pl.String and pl.List(pl.String) types are
-        supported. If None (default), returns a single column with all attributes as
-        a list of structs.
+        supported. If None (default), returns all attributes in the shape selected
+        by layout.
+    layout : {"aos", "soa"}, default "aos"
+        Output layout when schema is None; ignored otherwise.
+        - "aos": a single 'attributes' column of List[Struct{name, value}].
+        - "soa": two aligned List[String] columns, 'names' and 'values', sharing
+          one offsets buffer. Cheaper to build and to explode or filter by name.
+    categorical_names : bool, default False
+        Return attribute names as pl.Categorical instead of pl.String when schema
+        is None; ignored otherwise. Names come from a small vocabulary, so this
+        stores each distinct name once and makes grouping or filtering by name
+        compare integer codes rather than strings.
 
     Returns
     -------
     pl.DataFrame
-        DataFrame containing the RPSL data. If schema is None, contains a single
-        'attributes' column with List[Struct{name: String, value: String}].
+        DataFrame containing the RPSL data. If schema is None, contains either a
+        single 'attributes' column with List[Struct{name: String, value: String}]
+        or 'names' and 'values' columns with List[String], depending on layout.
+        Names are Categorical instead of String if categorical_names is set.
         If schema is provided, contains one column per schema field.
 
     Examples
@@ -43,6 +202,18 @@ def read_rpsl(
     >>> df.schema
     Schema({'attributes': List(Struct({'name': String, 'value': String}))})
 
+    Read attribute names and values into separate aligned lists:
+
+    >>> df = read_rpsl("data.txt", layout="soa")
+    >>> df.schema
+    Schema({'names': List(String), 'values': List(String)})
+
+    Read attribute names as Categorical:
+
+    >>> df = read_rpsl("data.txt", categorical_names=True)
+    >>> df.schema
+    Schema({'attributes': List(Struct({'name': Categorical, 'value': String}))})
+
     Read with schema (returns flat structure):
 
     >>> schema = pl.Schema({
@@ -58,6 +229,12 @@ def read_rpsl(
     >>> data = b"aut-num: AS123\\nmnt-by: EXAMPLE-MNT\\n\\n"
     >>> df = read_rpsl(data)
 
+    Read from a memory-mapped file:
+
+    >>> import mmap
+    >>> with open("data.txt", "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+    ...     df = read_rpsl(m)
+
     Read from a binary file-like object:
 
     >>> with open("data.txt", "rb") as f:
@@ -68,7 +245,7 @@ def read_rpsl(
     if schema is not None:
         if isinstance(schema, pl.Schema):
             # Convert Schema to empty DataFrame
-            schema_arg = pl.DataFrame(schema=schema)
+            schema_arg = _schema_to_empty_df(tuple(schema.items()))
         elif isinstance(schema, pl.DataFrame):
             # Use DataFrame's schema directly
             schema_arg = schema
@@ -77,20 +254,100 @@ def read_rpsl(
                 f"schema must be pl.Schema, pl.DataFrame, or None, got {type(schema).__name__}"
             )
 
-    # Handle different source types
-    if isinstance(source, bytes):
-        return _read_rpsl_bytes_rs(source, schema_arg)
-    elif hasattr(source, "read"):
-        # It's a file-like object - read all bytes
-        data = source.read()
-        if not isinstance(data, bytes):
-            raise TypeError(
-                f"file-like object must return bytes from read(), got {type(data).__name__}"
+    # Handle different source types, by exact type first
+    read = _DISPATCH.get(type(source))
+    if read is not None:
+        return read(source, schema_arg, layout, categorical_names)
+    return _read_any(source, schema_arg, layout, categorical_names)
+
+
+def scan_rpsl(
+    source: Union[str, Path, bytes, bytearray, memoryview, mmap.mmap],
+    schema: Union[pl.Schema, pl.DataFrame, None] = None,
+    layout: Literal["aos", "soa"] = "aos",
+    categorical_names: bool = False,
+) -> pl.LazyFrame:
+    """
+    Lazily read RPSL data from a file or buffer into a Polars LazyFrame.
+
+    Accepts the same arguments as read_rpsl. The source is read when the query is
+    collected, and only the schema columns the query actually uses are parsed:
+    attributes that are projected away are never materialized.
+
+    Parameters
+    ----------
+    source : str, Path, or bytes-like (bytes, bytearray, memoryview, mmap.mmap, ...)
+        Source of RPSL data, as for read_rpsl. File-like objects are not supported
+        because a LazyFrame may be collected more than once.
+    schema : pl.Schema, pl.DataFrame, or None, optional
+        Schema to use for reading the data, as for read_rpsl.
+    layout : {"aos", "soa"}, default "aos"
+        Output layout when schema is None, as for read_rpsl.
+    categorical_names : bool, default False
+        Return attribute names as pl.Categorical when schema is None, as for read_rpsl.
+
+    Returns
+    -------
+    pl.LazyFrame
+        LazyFrame producing the same data as read_rpsl.
+
+    Examples
+    --------
+    Only 'aut-num' is parsed; 'mnt-by' is never materialized:
+
+    >>> schema = pl.Schema({
+    ...     'aut-num': pl.String,
+    ...     'mnt-by': pl.List(pl.String),
+    ... })
+    >>> df = scan_rpsl("data.txt", schema=schema).select("aut-num").collect()
+    """
+    from polars.io.plugins import register_io_source
+
+    # mmap.mmap has read() but is read as a buffer, so check buffers first
+    is_buffer = isinstance(source, (bytes, bytearray, memoryview, mmap.mmap))
+    if not is_buffer and hasattr(source, "read"):
+        raise TypeError("scan_rpsl does not support file-like objects, use read_rpsl instead")
+
+    if schema is None:
+        name_dtype = pl.Categorical() if categorical_names else pl.String()
+        if layout == "soa":
+            full_schema = pl.Schema({"names": pl.List(name_dtype), "values": pl.List(pl.String)})
+        else:
+            full_schema = pl.Schema(
+                {"attributes": pl.List(pl.Struct({"name": name_dtype, "value": pl.String}))}
             )
-        return _read_rpsl_bytes_rs(data, schema_arg)
+    elif isinstance(schema, pl.Schema):
+        full_schema = schema
+    elif isinstance(schema, pl.DataFrame):
+        full_schema = schema.schema
     else:
-        # Assume it's a path
-        return _read_rpsl_rs(str(source), schema_arg)
+        raise TypeError(
+            f"schema must be pl.Schema, pl.DataFrame, or None, got {type(schema).__name__}"
+        )
+
+    def source_generator(
+        with_columns: Optional[List[str]],
+        predicate: Optional[pl.Expr],
+        n_rows: Optional[int],
+        batch_size: Optional[int],
+    ) -> Iterator[pl.DataFrame]:
+        read_schema = schema
+        if schema is not None and with_columns:
+            # Push the projection into the reader so unused attributes are skipped
+            read_schema = pl.Schema({name: full_schema[name] for name in with_columns})
+
+        df = read_rpsl(
+            source, schema=read_schema, layout=layout, categorical_names=categorical_names
+        )
+        if with_columns is not None:
+            df = df.select(with_columns)
+        if predicate is not None:
+            df = df.filter(predicate)
+        if n_rows is not None:
+            df = df.head(n_rows)
+        yield df
+
+    return register_io_source(source_generator, schema=full_schema)
 
 
-__all__ = ["read_rpsl"]
+__all__ = ["read_rpsl", "scan_rpsl"]
@@ -1,10 +1,11 @@
+import os
 import tempfile
 from pathlib import Path
 
 import polars as pl
 import pytest
 
-from polars_rpsl import read_rpsl
+from polars_rpsl import read_rpsl, scan_rpsl
 
 
 def test_read_rpsl():
@@ -220,6 +221,71 @@ origin:         AS65000
         Path(f.name).unlink()
 
 
+def test_read_gzip_detected_from_content():
+    """Test that gzip files are detected without a .gz suffix, including multi-member files."""
+    import gzip
+    
+    content = gzip.compress(b"route:          192.0.2.0/24\n\n") + gzip.compress(
+        b"route:          198.51.100.0/24\n"
+    )
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
+        f.write(content)
+        f.flush()
+        
+        df = read_rpsl(f.name, schema=pl.Schema({"route": pl.String}))
+        
+        assert df["route"].to_list() == ["192.0.2.0/24", "198.51.100.0/24"]
+        
+        Path(f.name).unlink()
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+def test_read_path_fifo():
+    """Test reading a path that is a FIFO rather than a regular file."""
+    import gzip
+    import threading
+    
+    content = b"route:          192.0.2.0/24\n\nroute:          198.51.100.0/24\n"
+    for payload in (content, gzip.compress(content)):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "pipe"
+            os.mkfifo(path)
+    
+            writer = threading.Thread(target=path.write_bytes, args=(payload,))
+            writer.start()
+            df = read_rpsl(path, schema=pl.Schema({"route": pl.String}))
+            writer.join()
+    
+            assert df["route"].to_list() == ["192.0.2.0/24", "198.51.100.0/24"]
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+def test_read_path_fifo_gzip_split_magic():
+    """Test that gzip is detected on a FIFO whose first read returns a single byte."""
+    import gzip
+    import threading
+    import time
+    
+    payload = gzip.compress(b"route:          192.0.2.0/24\n")
+    
+    def write(path):
+        with open(path, "wb", buffering=0) as f:
+            f.write(payload[:1])
+            time.sleep(0.1)
+            f.write(payload[1:])
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "pipe"
+        os.mkfifo(path)
+    
+        writer = threading.Thread(target=write, args=(path,))
+        writer.start()
+        df = read_rpsl(path, schema=pl.Schema({"route": pl.String}))
+        writer.join()
+    
+        assert df["route"].to_list() == ["192.0.2.0/24"]
+
+
 def test_read_with_schema_preserves_column_order():
     """Test that schema column order is preserved."""
     content = b"""origin:         AS65000
@@ -243,3 +309,447 @@ descr:          Test
         Path(f.name).unlink()
 
 
+# =============================================================================
+# File-like source tests
+# =============================================================================
+
+
+def test_read_from_open_file():
+    """Test reading from a file opened in binary mode."""
+    content = b"""route:          192.0.2.0/24
+origin:         AS65000
+
+route:          198.51.100.0/24
+origin:         AS65001
+"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
+        f.write(content)
+        f.flush()
+        
+        schema = pl.Schema({"route": pl.String, "origin": pl.String})
+        with open(f.name, "rb") as fh:
+            df = read_rpsl(fh, schema=schema)
+        
+        assert df["route"].to_list() == ["192.0.2.0/24", "198.51.100.0/24"]
+        assert df["origin"].to_list() == ["AS65000", "AS65001"]
+        
+        Path(f.name).unlink()
+
+
+def test_read_from_open_file_respects_position():
+    """Test that reading from a file object starts at its current position."""
+    content = b"""route:          192.0.2.0/24
+
+route:          198.51.100.0/24
+"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
+        f.write(content)
+        f.flush()
+        
+        schema = pl.Schema({"route": pl.String})
+        with open(f.name, "rb") as fh:
+            fh.readline()
+            df = read_rpsl(fh, schema=schema)
+            assert fh.read() == b""
+        
+        assert df["route"].to_list() == ["198.51.100.0/24"]
+        
+        Path(f.name).unlink()
+
+
+class _Stream:
+    """Minimal readable stream with no fileno(), seek() or known size."""
+    
+    def __init__(self, data):
+        import io
+        
+        self._data = io.BytesIO(data)
+    
+    def readinto(self, buf):
+        return self._data.readinto(buf)
+    
+    def read(self, size=-1):
+        return self._data.read(size)
+
+
+def test_read_from_stream():
+    """Test reading from a stream larger than a single read chunk."""
+    content = b"aut-num:        AS65000\nmnt-by:         MAINT-AS65000\n\n" * 50_000
+    df = read_rpsl(_Stream(content), schema=pl.Schema({"aut-num": pl.String}))
+    
+    assert df.shape == (50_000, 1)
+    assert df["aut-num"].unique().to_list() == ["AS65000"]
+
+
+def test_read_from_buffered_stream():
+    """Test reading small and large streams that are not backed by a file."""
+    import io
+    
+    obj = b"aut-num:        AS65000\nmnt-by:         MAINT-AS65000\n\n"
+    schema = pl.Schema({"aut-num": pl.String})
+    for count in (1, 50_000):
+        stream = io.BufferedReader(io.BytesIO(obj * count))
+        df = read_rpsl(stream, schema=schema)
+    
+        assert df.shape == (count, 1)
+        assert stream.read() == b""
+
+
+def test_read_from_gzip_file_object_does_not_seek_to_end():
+    """Test that compressed file objects are streamed without measuring their size."""
+    import gzip
+    import io
+    
+    class NoSeekToEnd(gzip.GzipFile):
+        def seek(self, offset, whence=io.SEEK_SET):
+            assert whence != io.SEEK_END, "seeking to the end decompresses the whole stream"
+            return super().seek(offset, whence)
+    
+    content = b"aut-num:        AS65000\n\n" * 1_000
+    stream = NoSeekToEnd(fileobj=io.BytesIO(gzip.compress(content)))
+    df = read_rpsl(stream, schema=pl.Schema({"aut-num": pl.String}))
+    
+    assert df.shape == (1_000, 1)
+
+
+def test_read_from_bytes_io_respects_position():
+    """Test that a BytesIO is read from its current position and left usable."""
+    import io
+    
+    stream = io.BytesIO(b"route:          192.0.2.0/24\n\nroute:          198.51.100.0/24\n")
+    stream.readline()
+    df = read_rpsl(stream, schema=pl.Schema({"route": pl.String}))
+    
+    assert df["route"].to_list() == ["198.51.100.0/24"]
+    assert stream.read() == b""
+    stream.write(b"\n")
+
+
+def test_read_from_closed_file():
+    """Test that reading a closed file object raises the usual ValueError."""
+    import io
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
+        f.write(b"route:          192.0.2.0/24\n")
+    
+    with open(f.name, "rb") as fh:
+        pass
+    with pytest.raises(ValueError, match="closed file"):
+        read_rpsl(fh)
+    
+    stream = io.BytesIO(b"route:          192.0.2.0/24\n")
+    stream.close()
+    with pytest.raises(ValueError, match="closed file"):
+        read_rpsl(stream)
+    
+    Path(f.name).unlink()
+
+
+def test_read_from_stream_propagates_exceptions():
+    """Test that exceptions raised while reading a stream are not wrapped."""
+    class Failing:
+        def readinto(self, buf):
+            raise KeyError("boom")
+    
+        def read(self, size=-1):
+            raise KeyError("boom")
+    
+    with pytest.raises(KeyError, match="boom"):
+        read_rpsl(Failing())
+
+
+# =============================================================================
+# Buffer source tests
+# =============================================================================
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_read_from_buffer(wrap):
+    """Test reading from objects supporting the buffer protocol."""
+    content = b"""route:          192.0.2.0/24
+origin:         AS65000
+"""
+    schema = pl.Schema({"route": pl.String, "origin": pl.String})
+    df = read_rpsl(wrap(content), schema=schema)
+    
+    assert df["route"].to_list() == ["192.0.2.0/24"]
+    assert df["origin"].to_list() == ["AS65000"]
+
+
+def test_read_from_buffer_subclass():
+    """Test that subclasses of supported source types are still accepted."""
+    class Data(bytes):
+        pass
+    
+    df = read_rpsl(Data(b"route:          192.0.2.0/24\n"), schema=pl.Schema({"route": pl.String}))
+    
+    assert df["route"].to_list() == ["192.0.2.0/24"]
+
+
+def test_read_from_mmap():
+    """Test reading from a memory-mapped file."""
+    import mmap
+    
+    content = b"""route:          192.0.2.0/24
+origin:         AS65000
+"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
+        f.write(content)
+        f.flush()
+        
+        schema = pl.Schema({"route": pl.String, "origin": pl.String})
+        with open(f.name, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            df = read_rpsl(m, schema=schema)
+        
+        assert df["route"].to_list() == ["192.0.2.0/24"]
+        assert df["origin"].to_list() == ["AS65000"]
+        
+        Path(f.name).unlink()
+
+
+def test_read_from_writable_buffer():
+    """Test reading large writable buffers, which are parsed in place with the GIL held."""
+    content = bytearray(b"aut-num:        AS65000\n\n" * 200_000)
+    schema = pl.Schema({"aut-num": pl.String})
+    
+    df = read_rpsl(content, schema=schema)
+    assert df.height == 200_000
+    
+    # The buffer is no longer exported, so it can be resized again
+    content += b"aut-num:        AS65001\n"
+    assert read_rpsl(memoryview(content), schema=schema).height == 200_001
+
+
+def test_read_with_schema_repeated_calls():
+    """Test that repeated calls with equal and differing schemas each use the right schema."""
+    content = b"""aut-num:        AS65000
+mnt-by:         MAINT-AS65000
+"""
+    for _ in range(2):
+        df = read_rpsl(content, schema=pl.Schema({"aut-num": pl.String}))
+        assert df.columns == ["aut-num"]
+    
+    df = read_rpsl(content, schema=pl.Schema({"aut-num": pl.String, "mnt-by": pl.List(pl.String)}))
+    assert df.columns == ["aut-num", "mnt-by"]
+    assert df["mnt-by"].to_list() == [["MAINT-AS65000"]]
+
+
+# =============================================================================
+# Layout tests
+# =============================================================================
+
+
+def test_read_soa_layout():
+    """Test the struct-of-arrays layout for schema-less reading."""
+    content = b"""route:          192.0.2.0/24
+origin:         AS65000
+descr:          Example route
+
+route:          198.51.100.0/24
+origin:         AS65001
+"""
+    df = read_rpsl(content, layout="soa")
+    
+    assert df.schema == pl.Schema({"names": pl.List(pl.String), "values": pl.List(pl.String)})
+    assert df["names"].to_list() == [["route", "origin", "descr"], ["route", "origin"]]
+    assert df["values"].to_list() == [
+        ["192.0.2.0/24", "AS65000", "Example route"],
+        ["198.51.100.0/24", "AS65001"],
+    ]
+
+
+def test_read_categorical_names():
+    """Test reading schema-less attribute names as Categorical."""
+    content = b"""route:          192.0.2.0/24
+origin:         AS65000
+descr:          Example route
+
+route:          198.51.100.0/24
+origin:         AS65001
+"""
+    df = read_rpsl(content, categorical_names=True)
+    
+    assert df.schema == pl.Schema(
+        {"attributes": pl.List(pl.Struct({"name": pl.Categorical(), "value": pl.String}))}
+    )
+    assert df["attributes"].to_list() == read_rpsl(content)["attributes"].to_list()
+    
+    df = read_rpsl(content, layout="soa", categorical_names=True)
+    
+    assert df.schema == pl.Schema(
+        {"names": pl.List(pl.Categorical()), "values": pl.List(pl.String)}
+    )
+    assert df["names"].to_list() == [["route", "origin", "descr"], ["route", "origin"]]
+
+
+def test_read_categorical_names_large():
+    """Test that Categorical names from parallel chunks concatenate correctly."""
+    # Later chunks see the names in a different order than the first one
+    obj_a = b"route: 192.0.2.0/24\norigin: AS65000\n\n"
+    obj_b = b"descr: Example\nmnt-by: EXAMPLE-MNT\n\n"
+    content = obj_a * 50_000 + obj_b * 50_000
+    
+    df = read_rpsl(content, layout="soa", categorical_names=True)
+    
+    assert df.height == 100_000
+    names = df["names"].explode()
+    assert names.dtype == pl.Categorical()
+    assert names.value_counts().sort("names")["count"].to_list() == [50_000] * 4
+
+
+def test_read_invalid_layout():
+    """Test that an unknown layout is rejected."""
+    with pytest.raises(ValueError, match="layout"):
+        read_rpsl(b"route: 192.0.2.0/24\n", layout="columnar")
+
+
+# =============================================================================
+# Lazy scan tests
+# =============================================================================
+
+
+def test_scan_with_schema_projection():
+    """Test that columns projected away are not parsed."""
+    # The duplicate 'origin' would fail a read that includes that column
+    content = b"""route:          192.0.2.0/24
+origin:         AS65000
+origin:         AS65001
+
+route:          198.51.100.0/24
+"""
+    schema = pl.Schema({"route": pl.String, "origin": pl.String})
+    lf = scan_rpsl(content, schema=schema)
+    
+    assert isinstance(lf, pl.LazyFrame)
+    assert lf.collect_schema() == schema
+    
+    df = lf.select("route").collect()
+    assert df["route"].to_list() == ["192.0.2.0/24", "198.51.100.0/24"]
+    
+    with pytest.raises(Exception, match="Duplicate value"):
+        lf.collect()
+
+
+def test_scan_with_filter_and_limit():
+    """Test that predicates and row limits are applied to lazy scans."""
+    content = b"""aut-num:        AS65000
+mnt-by:         MAINT-A
+
+aut-num:        AS65001
+mnt-by:         MAINT-B
+
+aut-num:        AS65002
+mnt-by:         MAINT-B
+"""
+    schema = pl.Schema({"aut-num": pl.String, "mnt-by": pl.List(pl.String)})
+    lf = scan_rpsl(content, schema=schema)
+    
+    df = lf.filter(pl.col("mnt-by").list.contains("MAINT-B")).select("aut-num").collect()
+    assert df["aut-num"].to_list() == ["AS65001", "AS65002"]
+    
+    assert lf.head(1).collect()["aut-num"].to_list() == ["AS65000"]
+
+
+def test_scan_from_mmap():
+    """Test that scan_rpsl accepts a memory-mapped file like read_rpsl does."""
+    import io
+    import mmap
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
+        f.write(b"route:          192.0.2.0/24\norigin:         AS65000\n")
+    
+    schema = pl.Schema({"route": pl.String, "origin": pl.String})
+    with open(f.name, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        df = scan_rpsl(m, schema=schema).select("route").collect()
+    
+    assert df["route"].to_list() == ["192.0.2.0/24"]
+    
+    with pytest.raises(TypeError, match="file-like"):
+        scan_rpsl(io.BytesIO(b"route:          192.0.2.0/24\n"))
+    
+    Path(f.name).unlink()
+
+
+# =============================================================================
+# Large input tests
+# =============================================================================
+
+
+def test_read_large_input_preserves_order():
+    """Test that large inputs, which are parsed in chunks, keep object order."""
+    content = b"".join(
+        b"aut-num:        AS%d\nmnt-by:         MAINT-%d\n\n" % (i, i) for i in range(200_000)
+    )
+    schema = pl.Schema({"aut-num": pl.String, "mnt-by": pl.List(pl.String)})
+    df = read_rpsl(content, schema=schema)
+    
+    assert df.shape == (200_000, 2)
+    assert df["aut-num"].to_list() == [f"AS{i}" for i in range(200_000)]
+    assert df["mnt-by"][-1].to_list() == ["MAINT-199999"]
+
+
+def test_read_large_input_stops_at_eof_literal():
+    """Test that nothing after an EOF literal is read, however the input is parsed."""
+    import gzip
+    
+    content = (
+        b"aut-num:        AS65000\n\n" * 200_000
+        + b"EOF\n\n"
+        + b"aut-num:        AS65001\n\n" * 200_000
+        + b"  continuation\n"
+    )
+    schema = pl.Schema({"aut-num": pl.String})
+    
+    df = read_rpsl(content, schema=schema)
+    assert df.height == 200_000
+    assert df["aut-num"].unique().to_list() == ["AS65000"]
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        plain = Path(tmpdir) / "plain.txt"
+        plain.write_bytes(content)
+        compressed = Path(tmpdir) / "compressed.txt.gz"
+        compressed.write_bytes(gzip.compress(content))
+    
+        assert read_rpsl(plain, schema=schema).equals(df)
+        assert read_rpsl(compressed, schema=schema).equals(df)
+
+
+def test_read_large_input_error_location():
+    """Test that errors in large inputs report positions in the whole input."""
+    content = b"aut-num:        AS65000\n\n" * 200_000 + b"  continuation\n"
+    
+    with pytest.raises(Exception, match="at line 400001"):
+        read_rpsl(content)
+    
+    with pytest.raises(Exception, match="at row 199999"):
+        read_rpsl(
+            b"aut-num:        AS65000\n\n" * 199_999 + b"aut-num: AS1\naut-num: AS2\n",
+            schema=pl.Schema({"aut-num": pl.String}),
+        )
+
+
+def test_read_concurrently_from_threads():
+    """Test that reads from several Python threads each get their own result."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    contents = [
+        b"".join(b"aut-num:        AS%d\n\n" % (n * 100_000 + i) for i in range(100_000))
+        for n in range(4)
+    ]
+    schema = pl.Schema({"aut-num": pl.String})
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for n, content in enumerate(contents):
+            path = Path(tmpdir) / f"shard{n}.txt"
+            path.write_bytes(content)
+            paths.append(path)
+    
+        # Streams are parsed without the GIL, re-acquiring it for each chunk
+        sources = paths + [_Stream(content) for content in contents]
+        with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+            dfs = list(pool.map(lambda source: read_rpsl(source, schema=schema), sources))
+    
+    for k, df in enumerate(dfs):
+        n = k % len(contents)
+        assert df["aut-num"].to_list() == [f"AS{n * 100_000 + i}" for i in range(100_000)]